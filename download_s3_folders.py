@@ -5,47 +5,292 @@ Downloads specific folders from S3 bucket using boto3 with AWS SSO profile
 """
 
 import os
+import queue
+import hashlib
 import sys
 import argparse
 import logging
+import logging.handlers
+import atexit
+import contextlib
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime
-from typing import List, Optional
+from typing import Iterator, List, Optional
 import boto3
-from botocore.exceptions import ClientError, NoCredentialsError, ProfileNotFound
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
+from botocore.exceptions import (
+    ClientError,
+    EndpointConnectionError,
+    NoCredentialsError,
+    ProfileNotFound,
+)
+from tenacity import (
+    retry,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_random_exponential,
+)
 from tqdm import tqdm
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.FileHandler("s3_download.log"),
-        logging.StreamHandler(sys.stdout),
-    ],
-)
+# The AWS Common Runtime transfer client is optional; fall back to the
+# pure-Python transfer manager when awscrt isn't installed. boto3.crt is
+# documented as private and may change, so failing to import it from a
+# future boto3 also just means the classic path is used
+try:
+    import awscrt  # noqa: F401
+    from boto3.crt import create_crt_transfer_manager
+except ImportError:
+    create_crt_transfer_manager = None
+
+# Configure logging. Records are handed off through a queue and written by
+# a background listener thread, so download workers never block on log I/O
+log_formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
+log_handlers = [
+    logging.handlers.RotatingFileHandler(
+        "s3_download.log", maxBytes=50 * 1024 * 1024, backupCount=5
+    ),
+    logging.StreamHandler(sys.stdout),
+]
+for log_handler in log_handlers:
+    log_handler.setFormatter(log_formatter)
+
+log_queue = queue.Queue(-1)
+log_listener = logging.handlers.QueueListener(log_queue, *log_handlers)
+log_listener.start()
+atexit.register(log_listener.stop)
+
+
+def flush_logs():
+    """Write out queued log records before printing directly to the console"""
+    # Stopping the listener drains the queue; restart it for later records
+    log_listener.stop()
+    log_listener.start()
+
+
+root_logger = logging.getLogger()
+root_logger.setLevel(logging.INFO)
+root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
 logger = logging.getLogger(__name__)
 
+# Ceiling on in-flight requests per top-level S3 prefix, kept well below
+# S3's per-prefix request rate limit to avoid SlowDown throttling
+MAX_REQUESTS_PER_PREFIX = 1000
+
+# S3 error codes worth retrying; any 5xx response is retried as well
+RETRYABLE_ERROR_CODES = {
+    "RequestTimeout",
+    "SlowDown",
+    "Throttling",
+    "ThrottlingException",
+    "RequestLimitExceeded",
+}
+
+
+def is_retryable_error(error: BaseException) -> bool:
+    """Check whether a transfer error is transient rather than permanent"""
+    if isinstance(error, EndpointConnectionError):
+        return True
+    if isinstance(error, ClientError):
+        code = error.response.get("Error", {}).get("Code")
+        status = error.response.get("ResponseMetadata", {}).get("HTTPStatusCode", 0)
+        return code in RETRYABLE_ERROR_CODES or status >= 500
+    return False
+
+
+class ByteCounter:
+    """Thread-safe transfer callback that totals the bytes received"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.total = 0
+
+    def __call__(self, bytes_amount: int):
+        with self.lock:
+            self.total += bytes_amount
+
+
+class DownloadJournal:
+    """SQLite record of per-file transfer state, used to resume interrupted runs"""
+
+    def __init__(self, db_path: str):
+        self.lock = threading.Lock()
+        self.failed = False
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        # In WAL mode NORMAL only fsyncs at checkpoints, so the per-file commits
+        # made under the lock don't each wait on the disk. A crash can lose the
+        # latest updates, which only means those files are checked again
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS files (
+                key TEXT PRIMARY KEY,
+                size INTEGER,
+                etag TEXT,
+                status TEXT,
+                attempts INTEGER,
+                updated_at TEXT
+            )
+            """
+        )
+        self.conn.commit()
+
+    def execute(self, sql: str, params: tuple) -> Optional[tuple]:
+        """Run one statement and return its first row, or None on error"""
+        # The journal is best-effort bookkeeping: errors such as another run
+        # holding the database locked are logged, never raised into a download
+        with self.lock:
+            try:
+                row = self.conn.execute(sql, params).fetchone()
+                self.conn.commit()
+                return row
+            except sqlite3.Error as e:
+                # Warn once; a locked or broken journal usually fails every call
+                log = logger.debug if self.failed else logger.warning
+                log(f"⚠️  Could not update journal for {params[0]}: {e}")
+                self.failed = True
+                return None
+
+    def is_done(self, s3_key: str, size: int, etag: Optional[str]) -> bool:
+        """Check whether this exact object version was already downloaded"""
+        row = self.execute(
+            "SELECT size, etag, status FROM files WHERE key = ?", (s3_key,)
+        )
+        return row == (size, etag, "done")
+
+    def start(self, s3_key: str, size: Optional[int], etag: Optional[str]):
+        """Record a file as in progress, resetting it if the object changed"""
+        self.execute(
+            """
+            INSERT INTO files (key, size, etag, status, attempts, updated_at)
+            VALUES (?, ?, ?, 'in_progress', 0, ?)
+            ON CONFLICT(key) DO UPDATE SET
+                attempts = CASE
+                    WHEN etag IS excluded.etag THEN attempts ELSE 0
+                END,
+                size = excluded.size,
+                etag = excluded.etag,
+                status = excluded.status,
+                updated_at = excluded.updated_at
+            """,
+            (s3_key, size, etag, datetime.now().isoformat()),
+        )
+
+    def add_attempt(self, s3_key: str):
+        """Count one transfer attempt for a file"""
+        self.execute(
+            """
+            UPDATE files SET attempts = attempts + 1, updated_at = ?2
+            WHERE key = ?1
+            """,
+            (s3_key, datetime.now().isoformat()),
+        )
+
+    def finish(self, s3_key: str, status: str):
+        """Record the outcome of a download attempt"""
+        self.execute(
+            "UPDATE files SET status = ?2, updated_at = ?3 WHERE key = ?1",
+            (s3_key, status, datetime.now().isoformat()),
+        )
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
 
 class S3FolderDownloader:
-    def __init__(self, bucket_name: str, region: str, profile: str, local_path: str):
+    def __init__(
+        self,
+        bucket_name: str,
+        region: str,
+        profile: str,
+        local_path: str,
+        max_workers: int = 16,
+        journal_path: Optional[str] = "s3_download.db",
+    ):
         self.bucket_name = bucket_name
         self.region = region
         self.profile = profile
         self.local_path = Path(local_path)
+        self.max_workers = max_workers
+        self.max_pool_connections = max(32, max_workers)
+
+        # Large objects are fetched as parallel ranged GETs; split the
+        # connection pool between workers so the two levels don't oversubscribe
+        max_concurrency = max(1, min(10, self.max_pool_connections // max_workers))
+        self.transfer_config = TransferConfig(
+            multipart_threshold=8 * 1024 * 1024,
+            multipart_chunksize=8 * 1024 * 1024,
+            max_concurrency=max_concurrency,
+            use_threads=True,
+        )
         self.s3_client = None
-        self.s3_resource = None
+        self.crt_manager = None
+        self.journal = None
+        if journal_path:
+            try:
+                self.journal = DownloadJournal(journal_path)
+            except sqlite3.Error as e:
+                logger.warning(f"⚠️  Could not open journal {journal_path}: {e}")
+
+        # Per-prefix semaphores are only needed once total in-flight requests
+        # can exceed MAX_REQUESTS_PER_PREFIX, i.e. with very high worker counts
+        # Set to stop listing threads when a run is interrupted
+        self.stop_event = threading.Event()
+
+        self.prefix_semaphores = None
+        self.prefix_semaphores_lock = threading.Lock()
+        if max_workers * max_concurrency > MAX_REQUESTS_PER_PREFIX:
+            self.prefix_semaphores = defaultdict(
+                lambda: threading.Semaphore(MAX_REQUESTS_PER_PREFIX)
+            )
 
     def initialize_s3_client(self) -> bool:
         """Initialize S3 client with the specified profile"""
         try:
             session = boto3.Session(profile_name=self.profile)
-            self.s3_client = session.client("s3", region_name=self.region)
-            self.s3_resource = session.resource("s3", region_name=self.region)
+
+            # One client is shared by all worker threads, so give it at least
+            # as many pooled connections as there are workers
+            config = Config(
+                max_pool_connections=self.max_pool_connections,
+                retries={"mode": "adaptive", "max_attempts": 10},
+                tcp_keepalive=True,
+            )
+            self.s3_client = session.client(
+                "s3", region_name=self.region, config=config
+            )
+
+            # self.transfer_config is tuned for the classic path; in particular its
+            # max_concurrency would cap CRT's connections per transfer, so let
+            # CRT choose its own part size and concurrency
+            if create_crt_transfer_manager is not None:
+                try:
+                    self.crt_manager = create_crt_transfer_manager(
+                        self.s3_client, None
+                    )
+                except Exception as e:
+                    logger.warning(
+                        f"⚠️  Could not set up CRT transfer client, using boto3: {e}"
+                    )
+                    self.crt_manager = None
+            if self.crt_manager is not None:
+                logger.info("⚡ Using CRT transfer client")
 
             # Test the connection
             self.s3_client.head_bucket(Bucket=self.bucket_name)
             logger.info(f"✓ Successfully connected to S3 bucket: {self.bucket_name}")
+
+            # The CRT client manages its own connections
+            if self.crt_manager is None:
+                self.warm_connection_pool()
             return True
 
         except ProfileNotFound:
@@ -71,102 +316,262 @@ class S3FolderDownloader:
             logger.error(f"❌ Unexpected error: {e}")
             return False
 
-    def list_folder_objects(self, folder_prefix: str) -> List[dict]:
-        """List all objects in a specific folder"""
-        objects = []
-        try:
-            paginator = self.s3_client.get_paginator("list_objects_v2")
-            page_iterator = paginator.paginate(
-                Bucket=self.bucket_name, Prefix=folder_prefix
-            )
+    def warm_connection_pool(self):
+        """Open the client's pooled connections up front with parallel HEADs"""
+        with ThreadPoolExecutor(max_workers=self.max_pool_connections) as executor:
+            futures = [
+                executor.submit(self.s3_client.head_bucket, Bucket=self.bucket_name)
+                for _ in range(self.max_pool_connections)
+            ]
+            for future in as_completed(futures):
+                # Best effort: a failed warm-up request only costs a later handshake
+                if future.exception() is not None:
+                    logger.debug(f"Connection warm-up failed: {future.exception()}")
+
+    def list_folder_pages(self, folder_prefix: str) -> Iterator[List[dict]]:
+        """Yield the objects in a specific folder one listing page at a time"""
+        paginator = self.s3_client.get_paginator("list_objects_v2")
+        page_iterator = paginator.paginate(
+            Bucket=self.bucket_name,
+            Prefix=folder_prefix,
+            FetchOwner=False,
+            PaginationConfig={"PageSize": 1000},
+        )
 
-            for page in page_iterator:
-                if "Contents" in page:
-                    objects.extend(page["Contents"])
+        for page in page_iterator:
+            yield page.get("Contents", [])
 
-            logger.info(f"Found {len(objects)} objects in folder: {folder_prefix}")
-            return objects
+    def is_up_to_date(
+        self, s3_key: str, local_file_path: Path, size: int, etag: Optional[str]
+    ) -> bool:
+        """Check whether a local file already matches the listed S3 object"""
+        if not local_file_path.exists() or local_file_path.stat().st_size != size:
+            return False
 
-        except ClientError as e:
-            logger.error(f"❌ Error listing objects in folder {folder_prefix}: {e}")
-            return []
+        # Trust the journal for files this script already downloaded
+        if self.journal is not None and self.journal.is_done(s3_key, size, etag):
+            return True
+
+        # Multipart ETags ("<md5>-<parts>") aren't an MD5 of the content,
+        # so a size match is the best check available for those
+        etag = (etag or "").strip('"')
+        if not etag or "-" in etag:
+            return True
 
-    def download_file(self, s3_key: str, local_file_path: Path) -> bool:
-        """Download a single file from S3"""
+        md5 = hashlib.md5()
+        with open(local_file_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                md5.update(chunk)
+        return md5.hexdigest() == etag
+
+    def download_file(
+        self,
+        s3_key: str,
+        local_file_path: Path,
+        size: Optional[int] = None,
+        etag: Optional[str] = None,
+    ) -> bool:
+        """Download a single file from S3 into an existing local directory"""
         try:
-            # Create parent directories if they don't exist
-            local_file_path.parent.mkdir(parents=True, exist_ok=True)
+            if size is not None and self.is_up_to_date(
+                s3_key, local_file_path, size, etag
+            ):
+                logger.debug(f"Skipping up-to-date file: {s3_key}")
+                if self.journal is not None and not self.journal.is_done(
+                    s3_key, size, etag
+                ):
+                    self.journal.start(s3_key, size, etag)
+                    self.record_status(s3_key, "done")
+                return True
+
+            if self.journal is not None:
+                self.journal.start(s3_key, size, etag)
 
             # Download the file
-            self.s3_client.download_file(self.bucket_name, s3_key, str(local_file_path))
+            self.transfer_file(s3_key, local_file_path, size)
+            self.record_status(s3_key, "done")
             return True
 
         except ClientError as e:
             logger.error(f"❌ Error downloading {s3_key}: {e}")
+            self.record_status(s3_key, "failed")
             return False
         except Exception as e:
             logger.error(f"❌ Unexpected error downloading {s3_key}: {e}")
+            self.record_status(s3_key, "failed")
             return False
 
-    def download_folder(self, folder_name: str) -> tuple[int, int]:
-        """Download all files from a specific folder"""
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_random_exponential(min=1, max=30),
+        retry=retry_if_exception(is_retryable_error),
+        reraise=True,
+    )
+    def transfer_file(
+        self, s3_key: str, local_file_path: Path, size: Optional[int] = None
+    ):
+        """Transfer a single object, retrying transient failures with backoff"""
+        if self.journal is not None:
+            self.journal.add_attempt(s3_key)
+
+        semaphore = contextlib.nullcontext()
+        if self.prefix_semaphores is not None:
+            with self.prefix_semaphores_lock:
+                semaphore = self.prefix_semaphores[s3_key.split("/", 1)[0]]
+
+        # Acquired per attempt, so backoff sleeps don't hold a slot
+        with semaphore:
+            if self.crt_manager is not None:
+                self.crt_manager.download(
+                    self.bucket_name, s3_key, str(local_file_path)
+                ).result()
+                return
+
+            # Write through a 1MB buffer into a preallocated temporary file,
+            # only moving it into place once the download has completed
+            # The temporary name is unique per attempt, so it can't collide
+            # with a sibling object such as "<name>.part"
+            part_file_path = local_file_path.with_name(
+                f".{local_file_path.name}.{os.urandom(8).hex()}.part"
+            )
+            written = ByteCounter()
+            try:
+                with open(part_file_path, "xb", buffering=1024 * 1024) as f:
+                    if size and hasattr(os, "posix_fallocate"):
+                        # Only an optimization; some filesystems (older ZFS,
+                        # network mounts) reject it with EINVAL/EOPNOTSUPP
+                        try:
+                            os.posix_fallocate(f.fileno(), 0, size)
+                        except OSError as e:
+                            logger.debug(f"Could not preallocate {s3_key}: {e}")
+                    self.s3_client.download_fileobj(
+                        Bucket=self.bucket_name,
+                        Key=s3_key,
+                        Fileobj=f,
+                        Config=self.transfer_config,
+                        Callback=written,
+                    )
+
+                    # The object may have changed since it was listed; drop any
+                    # preallocated bytes beyond what was actually received
+                    if size is not None and written.total != size:
+                        logger.warning(
+                            f"⚠️  {s3_key} changed since listing: "
+                            f"expected {size} bytes, got {written.total}"
+                        )
+                        f.truncate(written.total)
+                os.replace(part_file_path, local_file_path)
+            except BaseException:
+                part_file_path.unlink(missing_ok=True)
+                raise
+
+    def record_status(self, s3_key: str, status: str):
+        """Record a file's final status in the journal, if one is enabled"""
+        if self.journal is not None:
+            self.journal.finish(s3_key, status)
+
+    def prepare_files(
+        self, folder_name: str, objects: List[dict]
+    ) -> List[tuple[dict, Path]]:
+        """Map a folder's files to local paths and create their directories"""
         folder_prefix = f"{folder_name}/"
         local_folder_path = self.local_path / folder_name
 
-        logger.info(f"🔄 Starting download for folder: {folder_name}")
-
-        # List all objects in the folder
-        objects = self.list_folder_objects(folder_prefix)
-
-        if not objects:
-            logger.warning(f"⚠️  No objects found in folder: {folder_name}")
-            return 0, 0
-
-        # Filter out folder markers (objects ending with '/')
-        files = [obj for obj in objects if not obj["Key"].endswith("/")]
-
-        if not files:
-            logger.warning(f"⚠️  No files found in folder: {folder_name}")
-            return 0, 0
-
-        logger.info(f"📁 Downloading {len(files)} files from folder: {folder_name}")
-
-        successful_downloads = 0
-        failed_downloads = 0
-
-        # Create progress bar
-        with tqdm(
-            total=len(files), desc=f"Downloading {folder_name}", unit="file"
-        ) as pbar:
-            for obj in files:
-                s3_key = obj["Key"]
-                file_size = obj["Size"]
-
-                # Calculate relative path within the folder
-                relative_path = s3_key[len(folder_prefix) :]
-                local_file_path = local_folder_path / relative_path
-
-                # Update progress bar description with current file
-                pbar.set_postfix(
-                    file=relative_path[:30] + "..."
-                    if len(relative_path) > 30
-                    else relative_path
-                )
-
-                if self.download_file(s3_key, local_file_path):
-                    successful_downloads += 1
-                else:
-                    failed_downloads += 1
+        # Filter out folder markers (objects ending with '/') and map each
+        # S3 object to its local path within the folder
+        downloads = [
+            (obj, local_folder_path / obj["Key"][len(folder_prefix) :])
+            for obj in objects
+            if not obj["Key"].endswith("/")
+        ]
+
+        # Create each unique parent directory once, before the workers start;
+        # download_file relies on these already existing
+        for parent in {local_file_path.parent for _, local_file_path in downloads}:
+            parent.mkdir(parents=True, exist_ok=True)
+
+        return downloads
+
+    def submit_downloads(
+        self, executor: ThreadPoolExecutor, downloads: List[tuple[dict, Path]]
+    ) -> dict:
+        """Submit prepared downloads, returning a mapping of future to S3 object"""
+        # Largest first, so big transfers start immediately and small files
+        # fill the remaining workers instead of leaving a long tail
+        downloads = sorted(downloads, key=lambda d: d[0]["Size"], reverse=True)
+        return {
+            executor.submit(
+                self.download_file,
+                obj["Key"],
+                local_file_path,
+                obj["Size"],
+                obj.get("ETag"),
+            ): obj
+            for obj, local_file_path in downloads
+        }
 
-                pbar.update(1)
+    def progress_bar(self, desc: str) -> tqdm:
+        """Create a byte-based progress bar whose total grows as files are queued"""
+        # Progress is only updated from the thread consuming results, with tqdm
+        # throttling redraws, so workers never contend on the bar's lock
+        return tqdm(
+            total=0,
+            desc=desc,
+            unit="B",
+            unit_scale=True,
+            unit_divisor=1024,
+            mininterval=0.5,
+        )
 
-        logger.info(
-            f"✅ Completed folder {folder_name}: {successful_downloads} successful, {failed_downloads} failed"
+    def queue_folder(
+        self, folder_name: str, executor: ThreadPoolExecutor, events: queue.Queue
+    ):
+        """List a folder page by page, submitting its files as each page arrives"""
+        file_count = 0
+        try:
+            for page in self.list_folder_pages(f"{folder_name}/"):
+                if self.stop_event.is_set():
+                    return
+
+                downloads = self.prepare_files(folder_name, page)
+                if not downloads:
+                    continue
+
+                # Announce the files before submitting them, so the consumer
+                # counts them as pending before any of them can finish
+                events.put(("queued", folder_name, [obj for obj, _ in downloads]))
+                for future, obj in self.submit_downloads(executor, downloads).items():
+                    future.add_done_callback(
+                        partial(self.report_download, events, folder_name, obj)
+                    )
+                file_count += len(downloads)
+
+        # Any files queued so far still download, but the folder is failed
+        # since the rest of it was never listed
+        except ClientError as e:
+            logger.error(f"❌ Error listing objects in folder {folder_name}/: {e}")
+            events.put(("error", folder_name, e))
+            return
+        except Exception as e:
+            logger.error(f"❌ Unexpected error processing folder {folder_name}: {e}")
+            events.put(("error", folder_name, e))
+            return
+
+        events.put(("listed", folder_name, file_count))
+
+    def report_download(
+        self, events: queue.Queue, folder_name: str, obj: dict, future
+    ):
+        """Report a finished download back to the thread tracking progress"""
+        successful = (
+            not future.cancelled()
+            and future.exception() is None
+            and future.result()
         )
-        return successful_downloads, failed_downloads
+        events.put(("done", folder_name, (obj, successful)))
 
     def download_folders(self, folder_names: List[str]) -> dict:
-        """Download multiple folders"""
+        """Download multiple folders through a single shared worker pool"""
         results = {
             "total_folders": len(folder_names),
             "successful_folders": 0,
@@ -174,49 +579,103 @@ class S3FolderDownloader:
             "total_files": 0,
             "successful_files": 0,
             "failed_files": 0,
-            "start_time": datetime.now(),
             "folder_results": {},
         }
 
+        start_time = time.perf_counter()
+
         logger.info(f"🚀 Starting download of {len(folder_names)} folders")
         logger.info(f"📂 Local download path: {self.local_path}")
 
+        folder_results = results["folder_results"]
         for folder_name in folder_names:
-            try:
-                successful_files, failed_files = self.download_folder(folder_name)
-
-                results["folder_results"][folder_name] = {
-                    "successful_files": successful_files,
-                    "failed_files": failed_files,
-                }
-
-                results["total_files"] += successful_files + failed_files
-                results["successful_files"] += successful_files
-                results["failed_files"] += failed_files
+            folder_results[folder_name] = {"successful_files": 0, "failed_files": 0}
+
+        # List all folders in parallel, queueing each listing page on one
+        # shared download pool as soon as it arrives, so downloads start after
+        # the first page and small or skewed folders never leave the pool idle.
+        # Listing threads and finished downloads report back through a single
+        # event queue, so progress and counters are only touched on this thread
+        events = queue.Queue()
+        self.stop_event.clear()
+        with ThreadPoolExecutor(max_workers=8) as list_executor, ThreadPoolExecutor(
+            max_workers=self.max_workers
+        ) as executor, self.progress_bar("Downloading") as pbar:
+            for folder_name in folder_names:
+                list_executor.submit(self.queue_folder, folder_name, executor, events)
 
-                if failed_files == 0:
-                    results["successful_folders"] += 1
-                else:
-                    results["failed_folders"] += 1
+            try:
+                pending_listings = len(folder_names)
+                pending_files = 0
+                while pending_listings or pending_files:
+                    event, folder_name, value = events.get()
+
+                    if event == "queued":
+                        pending_files += len(value)
+                        pbar.total += sum(obj["Size"] for obj in value)
+                        pbar.refresh()
+                    elif event == "done":
+                        pending_files -= 1
+                        obj, successful = value
+                        if successful:
+                            folder_results[folder_name]["successful_files"] += 1
+                        else:
+                            folder_results[folder_name]["failed_files"] += 1
+                        pbar.update(obj["Size"])
+                    elif event == "listed":
+                        pending_listings -= 1
+                        if value == 0:
+                            logger.warning(
+                                f"⚠️  No files found in folder: {folder_name}"
+                            )
+                        else:
+                            logger.info(
+                                f"📁 Downloading {value} files "
+                                f"from folder: {folder_name}"
+                            )
+                    elif event == "error":
+                        pending_listings -= 1
+                        folder_results[folder_name]["error"] = str(value)
+            except BaseException:
+                # On Ctrl-C (or any error) drop everything still queued rather
+                # than letting the executors drain the whole remaining job
+                self.stop_event.set()
+                list_executor.shutdown(wait=False, cancel_futures=True)
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
+
+        for folder_name, folder_result in folder_results.items():
+            successful_files = folder_result["successful_files"]
+            failed_files = folder_result["failed_files"]
+
+            results["total_files"] += successful_files + failed_files
+            results["successful_files"] += successful_files
+            results["failed_files"] += failed_files
+
+            if failed_files == 0 and "error" not in folder_result:
+                results["successful_folders"] += 1
+            else:
+                results["failed_folders"] += 1
 
-            except Exception as e:
-                logger.error(
-                    f"❌ Unexpected error processing folder {folder_name}: {e}"
+            if "error" not in folder_result:
+                logger.info(
+                    f"✅ Completed folder {folder_name}: {successful_files} successful, {failed_files} failed"
                 )
-                results["failed_folders"] += 1
-                results["folder_results"][folder_name] = {
-                    "successful_files": 0,
-                    "failed_files": 0,
-                    "error": str(e),
-                }
 
-        results["end_time"] = datetime.now()
-        results["duration"] = results["end_time"] - results["start_time"]
+        results["duration_s"] = time.perf_counter() - start_time
 
         return results
 
+    def close(self):
+        """Release the transfer client and journal"""
+        if self.crt_manager is not None:
+            self.crt_manager.shutdown()
+        if self.journal is not None:
+            self.journal.close()
+
     def print_summary(self, results: dict):
         """Print download summary"""
+        flush_logs()
         print("\n" + "=" * 60)
         print("📊 DOWNLOAD SUMMARY")
         print("=" * 60)
@@ -226,18 +685,28 @@ class S3FolderDownloader:
         print(f"📄 Total files: {results['total_files']}")
         print(f"✅ Successful files: {results['successful_files']}")
         print(f"❌ Failed files: {results['failed_files']}")
-        print(f"⏱️  Duration: {results['duration']}")
+        print(f"⏱️  Duration: {results['duration_s']:.2f}s")
         print(f"📂 Download location: {self.local_path}")
 
         if results["failed_folders"] > 0:
             print("\n❌ Failed folders:")
             for folder, result in results["folder_results"].items():
-                if result.get("failed_files", 0) > 0:
+                if "error" in result:
+                    print(f"  - {folder}: {result['error']}")
+                elif result.get("failed_files", 0) > 0:
                     print(f"  - {folder}: {result.get('failed_files', 0)} failed files")
 
         print("=" * 60)
 
 
+def positive_int(value: str) -> int:
+    """Parse a command-line integer that must be at least 1"""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
 def main():
     parser = argparse.ArgumentParser(description="Download folders from AWS S3 bucket")
     parser.add_argument(
@@ -275,6 +744,22 @@ def main():
         ],
         help="List of folder names to download",
     )
+    parser.add_argument(
+        "--max-workers",
+        type=positive_int,
+        default=16,
+        help="Number of parallel file downloads (default: 16)",
+    )
+    parser.add_argument(
+        "--journal",
+        default="s3_download.db",
+        help="SQLite file tracking per-file progress (default: s3_download.db)",
+    )
+    parser.add_argument(
+        "--no-journal",
+        action="store_true",
+        help="Don't record per-file progress",
+    )
 
     args = parser.parse_args()
 
@@ -284,6 +769,8 @@ def main():
         region=args.region,
         profile=args.profile,
         local_path=args.local_path,
+        max_workers=args.max_workers,
+        journal_path=None if args.no_journal else args.journal,
     )
 
     # Initialize S3 client
@@ -294,7 +781,10 @@ def main():
     downloader.local_path.mkdir(parents=True, exist_ok=True)
 
     # Download folders
-    results = downloader.download_folders(args.folders)
+    try:
+        results = downloader.download_folders(args.folders)
+    finally:
+        downloader.close()
 
     # Print summary
     downloader.print_summary(results)